@@ -1,22 +1,38 @@
+import heapq
 import sys
+from array import array
+from collections import deque
 
-class Node():
-    def __init__(self, state, parent, action):
-        self.state = state
-        self.parent = parent
-        self.action = action
-        
-        
+# action that undoes each move, used when searching backwards from the goal
+OPPOSITE = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+# every move as (action, row offset, column offset)
+CANDIDATES = (
+    ("up", -1, 0),
+    ("down", 1, 0),
+    ("left", 0, -1),
+    ("right", 0, 1)
+)
+
+# actions are stored as one byte per cell during search: 0 means none, 1 is CANDIDATES[0] and so on
+ACTION_CODES = {action: code for code, (action, _, _) in enumerate(CANDIDATES, start=1)}
+ACTION_NAMES = (None,) + tuple(action for action, _, _ in CANDIDATES)
+
+# maps every byte of a maze file to 1 for a wall, or 0 for open space, the start and the goal
+WALL_TABLE = bytes(0 if chr(byte) in " AB" else 1 for byte in range(256))
 
-class StackFrontier():
+
+# removes the state with the lowest priority first (used for A* search)
+# a state may be queued more than once, the caller skips copies it has already explored
+class PriorityFrontier():
     def __init__(self):
         self.frontier = []
+        # tie-breaker so states with equal priority come out first-in first-out
+        self._counter = 0
         
-    def add(self, node):
-        self.frontier.append(node)
-        
-    def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+    def add(self, state, priority):
+        heapq.heappush(self.frontier, (priority, self._counter, state))
+        self._counter += 1
     
     def empty(self):
         return len(self.frontier) == 0
@@ -24,21 +40,7 @@ class StackFrontier():
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
-        else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
-            return node
-        
- # does everything a stackFrontier does except we remove the node as a queue first-in first-out       
-class QueueFrontier(StackFrontier):
-            
-    def remove(self):
-        if self.empty:
-            raise Exception("empty frontier")
-        else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
-            return node
+        return heapq.heappop(self.frontier)[2]
         
 
 class Maze():
@@ -64,33 +66,21 @@ class Maze():
         self.width = max(len(line) for line in contents)
         
         
-        #Keep track of walls
-        self.walls = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try:
-                    if contents[i][j] == "A":
-                        self.start = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == "B":
-                        self.goal = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == " ":
-                        row.append(False)
-                    else:
-                        row.append(True)
-                except IndexError:
-                    row.append(False)
-            self.walls.append(row)
+        #Keep track of walls, one byte per cell stored row by row (cell (i, j) is at i * width + j)
+        # short rows are padded with open space, then every cell is classified in a single translate
+        grid = "".join(line.ljust(self.width) for line in contents)
+        self.walls = bytearray(grid.encode("latin-1", errors="replace").translate(WALL_TABLE))
+        self.start = divmod(grid.index("A"), self.width)
+        self.goal = divmod(grid.index("B"), self.width)
         
         self.solution = None
                     
     def print(self):
         solution = self.solution[1] if self.solution is not None else None
         print()
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
+        for i in range(self.height):
+            for j in range(self.width):
+                col = self.walls[i * self.width + j]
                 if col:
                     print("#", end="")
                 elif (i, j) == self.start:
@@ -108,34 +98,55 @@ class Maze():
     def neighbors(self, state):
         row, col = state
         
-        # All possible actions
-        candidates = [
-            ("up", (row - 1, col)),
-            ("down", (row + 1, col)),
-            ("left", (row, col - 1)),
-            ("right", (row, col + 1))
-        ]
+        # read the maze attributes once rather than on every candidate move
+        height, width, walls = self.height, self.width, self.walls
         
-        # ensure actions are valid
+        # ensure actions stay inside the maze and do not walk into a wall
         result = []
-        for action, (r, c) in candidates:
-            try:
-                if not self.walls[r][c]:
-                    result.append((action, (r, c)))
-            except IndexError:
-                continue
+        for action, dr, dc in CANDIDATES:
+            r, c = row + dr, col + dc
+            if 0 <= r < height and 0 <= c < width and not walls[r * width + c]:
+                result.append((action, (r, c)))
         return result
     
+    def heuristic(self, state):
+        """manhattan distance from state to the goal"""
+        row, col = state
+        goal_row, goal_col = self.goal
+        return abs(row - goal_row) + abs(col - goal_col)
+    
+    def trace(self, parent, action, cell):
+        """follow parent links back from cell, returning the actions and cells that lead to it"""
+        actions = []
+        cells = []
+        while parent[cell] != -1:
+            actions.append(ACTION_NAMES[action[cell]])
+            cells.append(divmod(cell, self.width))
+            cell = parent[cell]
+        actions.reverse()
+        cells.reverse()
+        return actions, cells
+    
     def solve(self):
         """find a solution to maze, if one exits"""
         
         # keep track of number of states explored
         self.num_explored = 0
         
+        # search works on cell ids (row * width + col), with the parent, action and
+        # cheapest cost of every cell kept in flat arrays instead of one node object per visit
+        width = self.width
+        size = self.height * width
+        start = self.start[0] * width + self.start[1]
+        goal = self.goal[0] * width + self.goal[1]
+        parent = array("i", [-1]) * size
+        action = bytearray(size)
+        cost = array("i", [size]) * size
+        cost[start] = 0
+        
         #initialize fronties to just the starting position
-        start = Node(state=self.start, parent=None, action=None)
-        frontier = StackFrontier()
-        frontier.add(start)
+        frontier = PriorityFrontier()
+        frontier.add(start, self.heuristic(self.start))
         
         # initialize an empty explored set
         self.explored = set()
@@ -147,35 +158,98 @@ class Maze():
             if frontier.empty():
                 raise Exception("no solution")
             
-            # choose a node from the frontier
+            # choose a node from the frontier, skipping copies queued before a cheaper path was found
             node = frontier.remove()
+            state = divmod(node, width)
+            if state in self.explored:
+                continue
             self.num_explored += 1
             
             
             #if node is the goal, then we have a solution
-            if node.state == self.goal:
-                actions = []
-                cells = []
-                
-                # follow parent nodes to find solution
-                while node.parent is not None:
-                    actions.append(node.action)
-                    cells.append(node.state)
-                    node = node.parent
-                actions.reverse()
-                cells.reverse()
-                self.solution = (actions, cells)
+            if node == goal:
+                self.solution = self.trace(parent, action, goal)
                 return
             
             # mark node as explored
-            self.explored.add(node.state)
+            self.explored.add(state)
             
-            # add neighbors to frontier
-            for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in self.explored:
-                    child = Node(state=state, parent=node, action=action)
-                    frontier.add(child)
+            # add neighbors to frontier, ordered by cost so far plus distance to goal
+            for move, (r, c) in self.neighbors(state):
+                child = r * width + c
+                if cost[node] + 1 < cost[child]:
+                    cost[child] = cost[node] + 1
+                    parent[child] = node
+                    action[child] = ACTION_CODES[move]
+                    frontier.add(child, cost[child] + self.heuristic((r, c)))
             
+    def solve_bidirectional(self):
+        """find a solution by searching from the start and the goal at the same time"""
+        
+        # keep track of number of states explored
+        self.num_explored = 0
+        self.explored = set()
+        
+        # each side records, per cell id, the cell it was reached from, the action
+        # taken and the distance from where that side started (-1 while unreached)
+        width = self.width
+        size = self.height * width
+        start = self.start[0] * width + self.start[1]
+        goal = self.goal[0] * width + self.goal[1]
+        parent_f, parent_b = array("i", [-1]) * size, array("i", [-1]) * size
+        action_f, action_b = bytearray(size), bytearray(size)
+        depth_f, depth_b = array("i", [-1]) * size, array("i", [-1]) * size
+        depth_f[start] = 0
+        depth_b[goal] = 0
+        frontier_f, frontier_b = deque([start]), deque([goal])
+        
+        meetings = []
+        while not meetings:
+            
+            # if either side runs out of states, the two halves never meet
+            if not frontier_f or not frontier_b:
+                raise Exception("no solution")
+            
+            # expand one whole level of the smaller frontier
+            if len(frontier_f) <= len(frontier_b):
+                frontier, parent, action, depth, other = frontier_f, parent_f, action_f, depth_f, depth_b
+                backwards = False
+            else:
+                frontier, parent, action, depth, other = frontier_b, parent_b, action_b, depth_b, depth_f
+                backwards = True
+                
+            for _ in range(len(frontier)):
+                node = frontier.popleft()
+                state = divmod(node, width)
+                self.num_explored += 1
+                self.explored.add(state)
+                for move, (r, c) in self.neighbors(state):
+                    child = r * width + c
+                    if depth[child] != -1:
+                        continue
+                    
+                    # moves are reversible, so going backwards we record the move
+                    # that leads from child to node
+                    parent[child] = node
+                    action[child] = ACTION_CODES[OPPOSITE[move] if backwards else move]
+                    depth[child] = depth[node] + 1
+                    if other[child] != -1:
+                        meetings.append(child)
+                    frontier.append(child)
+                    
+        # the level may have touched the other side more than once, keep the shortest join
+        meet = min(meetings, key=lambda cell: depth_f[cell] + depth_b[cell])
+        
+        # walk back from the meeting point to the start
+        actions, cells = self.trace(parent_f, action_f, meet)
+        
+        # then forward from the meeting point to the goal
+        cell = meet
+        while parent_b[cell] != -1:
+            actions.append(ACTION_NAMES[action_b[cell]])
+            cell = parent_b[cell]
+            cells.append(divmod(cell, width))
+        self.solution = (actions, cells)
             
     def output_image(self, filename, show_solutions=True, show_explored=False):
         from PIL import Image, ImageDraw
@@ -192,8 +266,9 @@ class Maze():
         
         
         solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
+        for i in range(self.height):
+            for j in range(self.width):
+                col = self.walls[i * self.width + j]
                 
                 #walls
                 if col:
@@ -229,14 +304,19 @@ class Maze():
         img.save(filename)
 
 
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt")
+# A* is the default, --bidirectional searches from the start and the goal at once instead
+bidirectional = sys.argv[2:] == ["--bidirectional"]
+if len(sys.argv) != 2 and not bidirectional:
+    sys.exit("Usage: python maze.py maze.txt [--bidirectional]")
 
 m = Maze(sys.argv[1])
 print("Maze:")
 m.print()
 print("Solving...")
-m.solve()
+if bidirectional:
+    m.solve_bidirectional()
+else:
+    m.solve()
 print("States Explored:", m.num_explored)
 print("Solution:")
 m.print()
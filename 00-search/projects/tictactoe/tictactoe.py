@@ -3,12 +3,37 @@
 # objective: contains all the helper functions used in runner.py (simply put the backend of the game)
 
 import math
+from functools import lru_cache
 
 # Constants representing players and empty cells
 X = "X"
 O = "O"
 EMPTY = None
 
+# Every winning line as indices into the flattened board (cell (i, j) is index 3 * i + j)
+LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),  # Rows
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),  # Columns
+    (0, 4, 8), (2, 4, 6),             # Diagonals
+)
+
+# Bitboard constants used by the minimax search: cell (i, j) is bit 3 * i + j
+FULL = 0b111111111  # Every cell taken
+WINS = (
+    0b000000111, 0b000111000, 0b111000000,  # Rows
+    0b001001001, 0b010010010, 0b100100100,  # Columns
+    0b100010001, 0b001010100,               # Diagonals
+)
+
+# Lookup tables over all 512 masks, so the search never loops over lines or cells:
+# WINNING[mask] is True if mask covers a winning line,
+# FREE_BITS[mask] is the bit of every cell that mask leaves empty.
+WINNING = tuple(any(mask & line == line for line in WINS) for mask in range(FULL + 1))
+FREE_BITS = tuple(
+    tuple(1 << cell for cell in range(9) if not mask & (1 << cell))
+    for mask in range(FULL + 1)
+)
+
 """
 Name: initial_state
 Purpose: Returns the starting state of the board.
@@ -49,6 +74,8 @@ def actions(board):
 """
 Name: result
 Purpose: Returns a new board with the given move applied.
+         The copy keeps the caller's board untouched; the minimax search never calls this,
+         it applies moves by setting bits on immutable bitboard ints instead.
 
     Pseudo Code:
     check if action is valid (cell must be EMPTY)
@@ -70,24 +97,17 @@ Name: winner
 Purpose: Determines if there is a winner.
 
     Pseudo Code:
-    check each row, column, and diagonal for three matching marks
+    flatten the board into a single list of 9 cells
+    check each row, column, and diagonal in LINES for three matching marks
     if found, return the corresponding player
     otherwise, return None
 """
 def winner(board):
-    # Check rows and columns
-    for i in range(3):
-        if board[i][0] == board[i][1] == board[i][2] and board[i][0] is not EMPTY:
-            return board[i][0]  # Row win
-        if board[0][i] == board[1][i] == board[2][i] and board[0][i] is not EMPTY:
-            return board[0][i]  # Column win
-    
-    # Check diagonals
-    if board[0][0] == board[1][1] == board[2][2] and board[0][0] is not EMPTY:
-        return board[0][0]
-    if board[0][2] == board[1][1] == board[2][0] and board[0][2] is not EMPTY:
-        return board[0][2]
-    
+    flat = board[0] + board[1] + board[2]
+    for a, b, c in LINES:
+        mark = flat[a]
+        if mark is not EMPTY and mark == flat[b] == flat[c]:
+            return mark
     return None  # No winner yet
 
 """
@@ -100,7 +120,7 @@ Purpose: Checks if the game is over.
     otherwise, return False
 """
 def terminal(board):
-    return winner(board) is not None or all(cell is not EMPTY for row in board for cell in row)
+    return winner(board) is not None or EMPTY not in board[0] + board[1] + board[2]
 
 """
 Name: utility
@@ -119,80 +139,176 @@ def utility(board):
         return -1
     return 0
 
+"""
+Name: to_bitboard
+Purpose: Packs a board into two 9-bit integers, one holding X's cells and one holding O's.
+
+    Pseudo Code:
+    for each cell, set bit 3 * i + j in the mask of the player occupying it
+    return (x mask, o mask)
+"""
+def to_bitboard(board):
+    x = o = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == X:
+                x |= 1 << (3 * i + j)
+            elif board[i][j] == O:
+                o |= 1 << (3 * i + j)
+    return x, o
+
+"""
+Name: bitboard_actions
+Purpose: Returns the bit of every empty cell on a bitboard.
+
+    Pseudo Code:
+    look up the cells left empty by the combined mask x | o
+"""
+def bitboard_actions(x, o):
+    return FREE_BITS[x | o]
+
+"""
+Name: bitboard_winner
+Purpose: Determines if there is a winner on a bitboard.
+
+    Pseudo Code:
+    if a player's mask covers a winning line (precomputed in WINNING), return that player
+    otherwise, return None
+"""
+def bitboard_winner(x, o):
+    if WINNING[x]:
+        return X
+    if WINNING[o]:
+        return O
+    return None
+
+"""
+Name: bitboard_terminal
+Purpose: Checks if the game on a bitboard is over.
+"""
+def bitboard_terminal(x, o):
+    return bitboard_winner(x, o) is not None or (x | o) == FULL
+
+"""
+Name: bitboard_evaluate
+Purpose: Checks if the game on a bitboard is over and scores it in a single pass,
+         so the search does not look for a winner once for terminal and again for utility.
+
+    Pseudo Code:
+    if X covers a winning line, return (True, 1)
+    if O covers a winning line, return (True, -1)
+    if every cell is taken, return (True, 0)
+    otherwise, return (False, 0)
+"""
+def bitboard_evaluate(x, o):
+    if WINNING[x]:
+        return True, 1
+    if WINNING[o]:
+        return True, -1
+    if (x | o) == FULL:
+        return True, 0
+    return False, 0
+
 """
 Name: minimax
 Purpose: Determines the optimal move using the Minimax algorithm.
 
     Pseudo Code:
+    pack the board into a bitboard
     if board is terminal, return None
-    determine current player
+    determine current player once from the bit counts (X moves when it has no more marks than O)
     for each possible action:
-        simulate result of action
-        evaluate move using min_value or max_value
+        simulate result of action by setting its bit in the current player's mask
+        evaluate move using min_value or max_value, passing the best value found so far as a bound
         update best move accordingly
     return best move
 """
 def minimax(board):
-    if terminal(board):
+    x, o = to_bitboard(board)
+    if bitboard_terminal(x, o):
         return None  # No move if game is over
     
-    current_player = player(board)
+    current_player = X if x.bit_count() <= o.bit_count() else O
     best_action = None
+    alpha, beta = -math.inf, math.inf
     
     if current_player == X:
         best_value = -math.inf
         for action in actions(board):
-            value = min_value(result(board, action))
+            value = min_value(x | 1 << (3 * action[0] + action[1]), o, alpha, beta)
             if value > best_value:
                 best_value = value
                 best_action = action
+            alpha = max(alpha, best_value)  # Later moves must beat this to matter
     else:
         best_value = math.inf
         for action in actions(board):
-            value = max_value(result(board, action))
+            value = max_value(x, o | 1 << (3 * action[0] + action[1]), alpha, beta)
             if value < best_value:
                 best_value = value
                 best_action = action
+            beta = min(beta, best_value)  # Later moves must beat this to matter
     
     return best_action
 
 """
 Name: max_value
-Purpose: Computes the max value for the Minimax algorithm.
+Purpose: Computes the max value for the Minimax algorithm, with alpha-beta pruning.
+         The board is given as bitboard masks (x, o) and it is X's turn.
+         alpha is the best value X can already force elsewhere, beta the best O can force.
+         Results are cached per (x, o, alpha, beta), so a position reached through a different
+         move order (a transposition) is looked up instead of searched again. The bounds are part
+         of the key because a pruned search only returns a bound, not the exact value.
 
     Pseudo Code:
-    if board is terminal, return utility value
+    evaluate the board once, if it is terminal return its utility value
     set initial value to negative infinity
     for each action:
-        get the min_value of the result board
+        get the min_value of the board with the action's bit added to x
         update value if greater
+        if value >= beta, O will never allow this board, so stop searching
+        raise alpha to value
     return value
 """
-def max_value(board):
-    if terminal(board):
-        return utility(board)
+@lru_cache(maxsize=None)
+def max_value(x, o, alpha=-math.inf, beta=math.inf):
+    done, score = bitboard_evaluate(x, o)
+    if done:
+        return score
     value = -math.inf  # Worst case for maximizing player
-    for action in actions(board):
-        value = max(value, min_value(result(board, action)))
+    for bit in bitboard_actions(x, o):
+        value = max(value, min_value(x | bit, o, alpha, beta))
+        if value >= beta:
+            return value  # Prune: the minimizing player already has a better option
+        alpha = max(alpha, value)
     return value
 
 
 """
 Name: min_value
-Purpose: Computes the min value for the Minimax algorithm.
+Purpose: Computes the min value for the Minimax algorithm, with alpha-beta pruning.
+         The board is given as bitboard masks (x, o) and it is O's turn.
+         Results are cached the same way as max_value.
 
     Pseudo Code:
-    if board is terminal, return utility value
+    evaluate the board once, if it is terminal return its utility value
     set initial value to positive infinity
     for each action:
-        get the max_value of the result board
+        get the max_value of the board with the action's bit added to o
         update value if smaller
+        if value <= alpha, X will never allow this board, so stop searching
+        lower beta to value
     return value
 """
-def min_value(board):
-    if terminal(board):
-        return utility(board)
+@lru_cache(maxsize=None)
+def min_value(x, o, alpha=-math.inf, beta=math.inf):
+    done, score = bitboard_evaluate(x, o)
+    if done:
+        return score
     value = math.inf  # Worst case for minimizing player
-    for action in actions(board):
-        value = min(value, max_value(result(board, action)))
+    for bit in bitboard_actions(x, o):
+        value = min(value, max_value(x, o | bit, alpha, beta))
+        if value <= alpha:
+            return value  # Prune: the maximizing player already has a better option
+        beta = min(beta, value)
     return value
@@ -15,20 +15,13 @@ class Minesweeper():
         self.mines = set()
 
         # Initialize an empty field with no mines
-        self.board = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                row.append(False)
-            self.board.append(row)
+        self.board = [[False] * self.width for _ in range(self.height)]
 
-        # Add mines randomly
-        while len(self.mines) != mines:
-            i = random.randrange(height)
-            j = random.randrange(width)
-            if not self.board[i][j]:
-                self.mines.add((i, j))
-                self.board[i][j] = True
+        # Add mines randomly, drawing distinct cell indices in one call
+        for index in random.sample(range(height * width), mines):
+            i, j = divmod(index, width)
+            self.mines.add((i, j))
+            self.board[i][j] = True
 
         # At first, player has found no mines
         self.mines_found = set()
@@ -59,23 +52,17 @@ class Minesweeper():
         not including the cell itself.
         """
 
-        # Keep count of nearby mines
-        count = 0
-
-        # Loop over all cells within one row and column
-        for i in range(cell[0] - 1, cell[0] + 2):
-            for j in range(cell[1] - 1, cell[1] + 2):
-
-                # Ignore the cell itself
-                if (i, j) == cell:
-                    continue
+        i, j = cell
 
-                # Update count if cell in bounds and is mine
-                if 0 <= i < self.height and 0 <= j < self.width:
-                    if self.board[i][j]:
-                        count += 1
+        # Count mines in the 3x3 window clipped to the board, using row slices
+        # (the lower bounds are clamped so a negative index cannot wrap around)
+        count = 0
+        left = max(0, j - 1)
+        for row in self.board[max(0, i - 1):i + 2]:
+            count += row[left:j + 2].count(True)
 
-        return count
+        # Ignore the cell itself
+        return count - self.board[i][j]
 
     def won(self):
         """
@@ -92,14 +79,15 @@ class Sentence():
     """
 
     def __init__(self, cells, count):
-        self.cells = set(cells)
+        # Immutable, so the cells can be used directly as a dictionary key
+        self.cells = frozenset(cells)
         self.count = count
 
     def __eq__(self, other):
         return self.cells == other.cells and self.count == other.count
 
     def __str__(self):
-        return f"{self.cells} = {self.count}"
+        return f"{set(self.cells)} = {self.count}"
 
     def known_mines(self):
         """
@@ -125,7 +113,7 @@ class Sentence():
         a cell is known to be a mine.
         """
         if cell in self.cells:
-            self.cells.remove(cell)
+            self.cells = self.cells - {cell}
             self.count -= 1
 
     def mark_safe(self, cell):
@@ -134,7 +122,7 @@ class Sentence():
         a cell is known to be safe.
         """
         if cell in self.cells:
-            self.cells.remove(cell)
+            self.cells = self.cells - {cell}
 
 
 class MinesweeperAI():
@@ -196,19 +184,10 @@ class MinesweeperAI():
         self.moves_made.add(cell)
         self.mark_safe(cell)
 
-        # 3) Determine the neighboring cells that are neither known safe nor known mines.
+        # 3) Determine the neighboring cells that are neither known safe nor known mines,
+        # adjusting count by subtracting the known mines among neighbors in the same pass.
         i, j = cell
         neighbors = set()
-        for ni in range(i - 1, i + 2):
-            for nj in range(j - 1, j + 2):
-                if (ni, nj) == cell:
-                    continue
-                if 0 <= ni < self.height and 0 <= nj < self.width:
-                    if (ni, nj) in self.safes or (ni, nj) in self.mines:
-                        continue
-                    neighbors.add((ni, nj))
-
-        # Adjust count by subtracting the known mines among neighbors.
         for ni in range(i - 1, i + 2):
             for nj in range(j - 1, j + 2):
                 if (ni, nj) == cell:
@@ -216,6 +195,8 @@ class MinesweeperAI():
                 if 0 <= ni < self.height and 0 <= nj < self.width:
                     if (ni, nj) in self.mines:
                         count -= 1
+                    elif (ni, nj) not in self.safes:
+                        neighbors.add((ni, nj))
 
         # Only add a sentence if there are undetermined neighbor cells.
         if len(neighbors) > 0:
@@ -253,24 +234,36 @@ class MinesweeperAI():
                         updated = True
 
             # 5) Infer new sentences from existing ones.
+            # Only a shorter sentence can be a proper subset of a longer one,
+            # so group the sentences by size and compare each size with the larger ones.
+            by_len = {}
+            for sentence in self.knowledge:
+                if sentence.cells:
+                    by_len.setdefault(len(sentence.cells), []).append(sentence)
+            lengths = sorted(by_len)
+
+            # Keep every known set of cells, so duplicates are found with a hash lookup.
+            seen = {sentence.cells for sentence in self.knowledge}
+
             new_sentences = []
-            for sentence1 in self.knowledge:
-                for sentence2 in self.knowledge:
-                    if sentence1 == sentence2:
-                        continue
-                    # If sentence1 is a subset of sentence2, then we can infer a new sentence.
-                    if sentence1.cells and sentence1.cells.issubset(sentence2.cells):
-                        new_cells = sentence2.cells - sentence1.cells
-                        new_count = sentence2.count - sentence1.count
-                        new_sentence = Sentence(new_cells, new_count)
-                        if new_sentence not in self.knowledge and new_sentence not in new_sentences and len(new_sentence.cells) > 0:
-                            new_sentences.append(new_sentence)
+            for index, len1 in enumerate(lengths):
+                for len2 in lengths[index + 1:]:
+                    for sentence1 in by_len[len1]:
+                        for sentence2 in by_len[len2]:
+                            # If sentence1 is a subset of sentence2, then we can infer a new sentence.
+                            if sentence1.cells.issubset(sentence2.cells):
+                                new_cells = sentence2.cells - sentence1.cells
+                                new_count = sentence2.count - sentence1.count
+                                if new_cells not in seen:
+                                    seen.add(new_cells)
+                                    new_sentences.append(Sentence(new_cells, new_count))
             if new_sentences:
                 self.knowledge.extend(new_sentences)
                 updated = True
 
-        # Optional clean-up: Remove any empty sentences.
-        self.knowledge = [s for s in self.knowledge if s.cells]
+        # Optional clean-up: Remove any empty sentences, and keep one sentence
+        # per set of cells when marking cells has made several of them identical.
+        self.knowledge = list({s.cells: s for s in self.knowledge if s.cells}.values())
 
     def make_safe_move(self):
         """
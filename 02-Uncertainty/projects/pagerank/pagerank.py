@@ -1,11 +1,19 @@
+import mmap
 import os
 import random
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
 
 DAMPING = 0.85
 SAMPLES = 10000
 
+# Compiled once, matching on raw bytes so files never need decoding as a whole
+LINK_PATTERN = re.compile(rb"<a\s+(?:[^>]*?)href=\"([^\"]*)\"")
+
 
 def main():
     if len(sys.argv) != 2:
@@ -33,17 +41,27 @@ def crawl(directory):
     for filename in os.listdir(directory):
         if not filename.endswith(".html"):
             continue
-        with open(os.path.join(directory, filename)) as f:
-            contents = f.read()
-            links = re.findall(r"<a\s+(?:[^>]*?)href=\"([^\"]*)\"", contents)
-            pages[filename] = set(links) - {filename}
+        # Page names are interned, so comparing a link with a page is a pointer check
+        filename = sys.intern(filename)
+        with open(os.path.join(directory, filename), "rb") as f:
+            # Empty files cannot be memory-mapped, and have no links anyway
+            if os.fstat(f.fileno()).st_size == 0:
+                links = set()
+            else:
+                # Let the OS page the file in rather than reading it into one string
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as contents:
+                    links = {
+                        sys.intern(match.group(1).decode())
+                        for match in LINK_PATTERN.finditer(contents)
+                    }
+            pages[filename] = links - {filename}
 
     # Only include links to other pages in the corpus
+    # (a C-level intersection with the dict's key view, no Python-level filtering),
+    # frozen since the links never change afterwards and a frozenset caches its hash
+    corpus_pages = pages.keys()
     for filename in pages:
-        pages[filename] = set(
-            link for link in pages[filename]
-            if link in pages
-        )
+        pages[filename] = frozenset(pages[filename] & corpus_pages)
 
     return pages
 
@@ -58,31 +76,92 @@ def transition_model(corpus, page, damping_factor):
     a link at random chosen from all pages in the corpus.
     """
 
-    distribution = {}
-    pages = list(corpus.keys())
-    n = len(pages)
+    # dict.fromkeys walks the corpus keys directly, so no list of pages is built per call
+    n = len(corpus)
     links = corpus.get(page)
 
-    #if no outgoing links, treat as linking to all pages
+    #if no outgoing links, treat as linking to all pages, so every page is equally likely
     if not links:
-        links = set(pages)
+        return dict.fromkeys(corpus, 1 / n)
 
-    num_links = len(links)
     base_prob = (1 - damping_factor) / n
+    link_prob = damping_factor / len(links)
 
     # initialize all to base prob
-    for p in pages:
-        distribution[p] = base_prob
+    distribution = dict.fromkeys(corpus, base_prob)
 
     # distribute damping among linked pages
     for linked in links:
-        distribution[linked] += damping_factor / num_links
+        distribution[linked] += link_prob
 
     return distribution
 
 
+def to_csr(corpus):
+    """
+    Convert a corpus to flat NumPy arrays indexed by page number, in
+    compressed sparse row form.
+
+    Return `(pages, indptr, indices, inv_outdeg, dangling)`: `pages`
+    lists the page names, the links of page `i` are the page numbers
+    `indices[indptr[i]:indptr[i + 1]]`, `inv_outdeg[i]` is one over
+    its number of links (0 if it has none) and `dangling[i]` is True
+    if it has no links.
+    """
+    pages = list(corpus.keys())
+    n = len(pages)
+    index = {p: i for i, p in enumerate(pages)}
+
+    outdeg = np.fromiter((len(corpus[p]) for p in pages), dtype=np.int32, count=n)
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(outdeg, out=indptr[1:])
+    indices = np.fromiter(
+        (index[link] for p in pages for link in corpus[p]),
+        dtype=np.int32, count=int(indptr[-1])
+    )
+
+    dangling = outdeg == 0
+    # Weights stay float64: the iteration's bincount sums its weights in float64
+    # anyway, so float32 ranks and weights would only add casts
+    inv_outdeg = np.zeros(n)
+    inv_outdeg[~dangling] = 1 / outdeg[~dangling]
+
+    return pages, indptr, indices, inv_outdeg, dangling
+
 
-def sample_pagerank(corpus, damping_factor, n):
+def random_walk(outlinks, damping_factor, n, rng=random):
+    """
+    Sample `n` pages by walking the transition model, starting with a
+    page at random. `outlinks[i]` holds the page numbers page `i` links
+    to, and `rng` supplies the random numbers.
+
+    Return a NumPy array counting how often each page was sampled.
+    """
+    num_pages = len(outlinks)
+    samples = [0] * n
+
+    # start from a random page
+    current = rng.randrange(num_pages)
+
+    # generate every sample straight from the definition of the transition model,
+    # stepping before recording so the loop owns all `n` samples:
+    # with probability `damping_factor` follow one of the page's links, otherwise
+    # (or if it has no links) jump to any page, so no distribution has to be built
+    for k in range(n):
+        links = outlinks[current]
+        if links and rng.random() < damping_factor:
+            current = links[int(rng.random() * len(links))]
+        else:
+            current = int(rng.random() * num_pages)
+        samples[k] = current
+
+    # move the samples into a NumPy index array in one pass (the dtype and
+    # length are known up front) and count them with a single bincount
+    samples = np.fromiter(samples, dtype=np.intp, count=n)
+    return np.bincount(samples, minlength=num_pages)
+
+
+def sample_pagerank(corpus, damping_factor, n, workers=1):
     """
     Return PageRank values for each page by sampling `n` pages
     according to transition model, starting with a page at random.
@@ -90,31 +169,35 @@ def sample_pagerank(corpus, damping_factor, n):
     Return a dictionary where keys are page names, and values are
     their estimated PageRank value (a value between 0 and 1). All
     PageRank values should sum to 1.
-    """
-    pages = list(corpus.keys())
-    counts = {p: 0 for p in pages}
-
-    # first sammple: random page
-    current = random.choice(pages)
-    counts[current] += 1
 
-    # generate remaning samples
-    for _ in range(1, n):
-        model = transition_model(corpus, current, damping_factor)
-
-        # choose next page based on distr
-        next_page = random.choices(
-            population = list(model.keys()),
-            weights = list(model.values()),
-            k = 1
-        )[0]
-
-        counts[next_page] +=1
-        current = next_page
+    With `workers` above 1, the samples are split between that many
+    independent walks run in separate processes.
+    """
+    if n < 1:
+        raise ValueError("n must be at least 1")
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    pages, indptr, indices, _, _ = to_csr(corpus)
+    num_pages = len(pages)
+
+    # each page's links as a tuple of page indices (empty if it has none),
+    # sliced out of the CSR arrays once so the walk never touches page names
+    indptr, indices = indptr.tolist(), indices.tolist()
+    outlinks = [tuple(indices[indptr[i]:indptr[i + 1]]) for i in range(num_pages)]
+
+    if workers == 1:
+        counts = random_walk(outlinks, damping_factor, n)
+    else:
+        # every walk gets its own share of the samples and its own generator, seeded
+        # from this one, and only sends back its counts, which are summed at the end
+        steps = [n // workers + (k < n % workers) for k in range(workers)]
+        rngs = [random.Random(random.getrandbits(64)) for _ in range(workers)]
+        with ProcessPoolExecutor(workers) as pool:
+            counts = sum(pool.map(random_walk, repeat(outlinks), repeat(damping_factor), steps, rngs))
 
     # convert counts to prob
-    ranks = {p: counts[p] / n for p in pages}
-    return ranks
+    return dict(zip(pages, (counts / n).tolist()))
 
 
 
@@ -127,40 +210,35 @@ def iterate_pagerank(corpus, damping_factor):
     their estimated PageRank value (a value between 0 and 1). All
     PageRank values should sum to 1.
     """
-    pages = list(corpus.keys())
+    pages, indptr, indices, inv_outdeg, dangling = to_csr(corpus)
     n = len(pages)
+    base = (1 - damping_factor) / n
+    # The page each link starts from, lined up with `indices`
+    sources = np.repeat(np.arange(n), np.diff(indptr))
+
+    # Fold the damping factor into the weights once: each link carries
+    # `damping_factor / num_links` of its page's rank, and a page with no links
+    # gives `damping_factor / N` of its rank to every page
+    link_weight = damping_factor * inv_outdeg[sources]
+    spread = damping_factor / n
+
     # Initialize ranks to 1/N
-    ranks = {p: 1 / n for p in pages}
+    ranks = np.full(n, 1 / n)
     threshold = 0.001
     converged = False
 
     while not converged:
-        new_ranks = {}
-        for p in pages:
-            # Random jump component
-            rank_sum = (1 - damping_factor) / n
-            # Sum over all pages that link to p
-            total = 0
-            for i in pages:
-                links = corpus.get(i)
-                # Treat pages with no links as linking to all pages
-                if not links:
-                    link_set = set(pages)
-                else:
-                    link_set = links
-                if p in link_set:
-                    total += ranks[i] / len(link_set)
-            rank_sum += damping_factor * total
-            new_ranks[p] = rank_sum
-
-        # Check convergence
-        converged = True
-        for p in pages:
-            if abs(new_ranks[p] - ranks[p]) > threshold:
-                converged = False
+        # Every page sums the rank arriving along its incoming links, plus the rank spread
+        # by pages with no links; each page only reads the old ranks, so the whole step is
+        # one gather and a bincount over the link targets, pushed along the links in C
+        incoming = np.bincount(indices, weights=ranks[sources] * link_weight, minlength=n)
+        new_ranks = base + spread * ranks[dangling].sum() + incoming
+
+        # Check convergence on the largest change of any page (the L-infinity norm)
+        converged = np.abs(new_ranks - ranks).max() <= threshold
         ranks = new_ranks
 
-    return ranks
+    return dict(zip(pages, ranks.tolist()))
 
 
 if __name__ == "__main__":